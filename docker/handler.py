@@ -11,11 +11,20 @@ Uploads results to Cloudflare R2
 
 import os
 import json
+import shutil
+import functools
+import hashlib
 import subprocess
 import tempfile
 import requests
+from requests.adapters import HTTPAdapter, Retry
 import re
 import time
+import threading
+import queue
+import bisect
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 import runpod
 import torch
@@ -26,9 +35,15 @@ import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 import math
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config
 import gc
 
+try:
+    import orjson  # noqa: F401 - optional, ~3x faster than stdlib json
+except ImportError:
+    orjson = None
+
 # ============================================
 # CONFIGURATION
 # ============================================
@@ -36,6 +51,34 @@ import gc
 SAMPLE_RATE = 44100
 DEMUCS_MODEL = "htdemucs"
 
+# Shared HTTP session - reuses pooled connections so repeated calls
+# (downloads, AssemblyAI polling, callbacks) skip the TCP+TLS handshake
+# Keep torch's intra-op pool to half the cores: on CPU fallback the other
+# half stays free for the encoder and upload threads, and on GPU workers the
+# CPU side only does resampling anyway
+torch.set_num_threads(max(1, (os.cpu_count() or 2) // 2))
+# Demucs always sees the same segment shape (split=True chunks the track),
+# so let cuDNN autotune its conv algorithms once and reuse them
+torch.backends.cudnn.benchmark = True
+
+_SESSION = requests.Session()
+_retrying_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                                max_retries=Retry(total=3, backoff_factor=0.3))
+_SESSION.mount('https://', _retrying_adapter)
+_SESSION.mount('http://', _retrying_adapter)
+
+
+def _post_json(url, payload):
+    """POST a JSON payload, serializing with orjson when it's available.
+
+    Callback payloads carry word-level timestamps for the whole song, so
+    serialization is worth skipping stdlib json for.
+    """
+    if orjson is not None:
+        return _SESSION.post(url, data=orjson.dumps(payload),
+                             headers={'Content-Type': 'application/json'})
+    return _SESSION.post(url, json=payload)
+
 # AssemblyAI
 ASSEMBLYAI_API_KEY = os.environ.get('ASSEMBLYAI_API_KEY')
 ASSEMBLYAI_UPLOAD_URL = "https://api.assemblyai.com/v2/upload"
@@ -45,6 +88,10 @@ ASSEMBLYAI_TRANSCRIPT_URL = "https://api.assemblyai.com/v2/transcript"
 VIDEO_WIDTH = 1920
 VIDEO_HEIGHT = 1080
 FPS = 30
+# Per-quality render scale: frames are built at output size * scale and FFmpeg
+# upscales the rest. 4K renders at 1080p (1/4 the pixel work); lower tiers
+# render 1:1 because downscaling them would hurt text legibility
+RENDER_SCALES = {'4k': 0.5}
 FONT_SIZE_LYRICS = 64
 FONT_SIZE_TITLE = 96
 FONT_SIZE_ARTIST = 64
@@ -85,7 +132,7 @@ WATERMARK_PADDING = 20  # Padding from edges
 # PROFANITY FILTER
 # ============================================
 
-PROFANITY_LIST = {
+PROFANITY_LIST = frozenset({
     'fuck', 'fucking', 'fucked', 'fucker', 'fuckers', 'fucks', 'fuckin',
     'shit', 'shitting', 'shitted', 'shitty', 'bullshit', 'shits',
     'ass', 'asses', 'asshole', 'assholes', 'badass',
@@ -120,7 +167,14 @@ PROFANITY_LIST = {
     'wtf', 'stfu', 'lmfao', 'lmao',
     'mofo', 'motherfucker', 'motherfucking', 'motherfuckers', 'muthafucka',
     'hoe', 'hoes', 'thot', 'thots',
-}
+})
+
+
+# Compiled once - censor_word runs per transcript word, so no per-call
+# regex compilation or per-character Python loop
+_WORD_CLEAN_RE = re.compile(r"[^a-zA-Z']")
+_CENSOR_TRANS = str.maketrans(
+    {c: '#' for c in 'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ'})
 
 
 def censor_word(word):
@@ -128,15 +182,10 @@ def censor_word(word):
     if not word:
         return word
     
-    clean_word = re.sub(r'[^a-zA-Z\']', '', word).lower()
+    clean_word = _WORD_CLEAN_RE.sub('', word).lower()
     
     if clean_word in PROFANITY_LIST:
-        result = ''
-        for char in word:
-            if char.isalpha():
-                result += '#'
-            else:
-                result += char
+        result = word.translate(_CENSOR_TRANS)
         print(f"   Censored: '{word}' -> '{result}'")
         return result
     
@@ -174,11 +223,21 @@ def get_r2_client():
         endpoint_url=os.environ.get('CLOUDFLARE_R2_ENDPOINT'),
         aws_access_key_id=os.environ.get('CLOUDFLARE_R2_ACCESS_KEY'),
         aws_secret_access_key=os.environ.get('CLOUDFLARE_R2_SECRET_KEY'),
-        config=Config(signature_version='s3v4'),
+        config=Config(signature_version='s3v4',
+                      max_pool_connections=16,
+                      retries={'mode': 'adaptive'}),
         region_name='auto'
     )
 
 
+_R2_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+
 def upload_to_r2(file_path, key):
     """Upload a file to R2 and return the public URL"""
     try:
@@ -195,13 +254,13 @@ def upload_to_r2(file_path, key):
         else:
             content_type = 'application/octet-stream'
         
-        with open(file_path, 'rb') as f:
-            client.put_object(
-                Bucket=bucket,
-                Key=key,
-                Body=f,
-                ContentType=content_type
-            )
+        # upload_file streams the file in 8MB multipart chunks over several
+        # connections instead of buffering the whole thing for one PUT
+        client.upload_file(
+            file_path, bucket, key,
+            ExtraArgs={'ContentType': content_type},
+            Config=_R2_TRANSFER_CONFIG
+        )
         
         url = f"{public_url}/{key}"
         print(f"✅ Uploaded to R2: {url}")
@@ -218,11 +277,13 @@ def upload_to_r2(file_path, key):
 
 def download_file(url, destination):
     """Download file from URL"""
-    response = requests.get(url, stream=True)
+    response = _SESSION.get(url, stream=True)
     response.raise_for_status()
+    # copyfileobj moves 1MB blocks in C instead of a Python loop over
+    # 8KB chunks - audio files here are tens of MB
+    response.raw.decode_content = True
     with open(destination, 'wb') as f:
-        for chunk in response.iter_content(chunk_size=8192):
-            f.write(chunk)
+        shutil.copyfileobj(response.raw, f, length=1024 * 1024)
     return destination
 
 
@@ -278,7 +339,7 @@ def download_font(font_name):
         font_path = FONT_PATHS[font_name]
         
         print(f"   📥 Downloading font: {font_name}...")
-        response = requests.get(url, timeout=30)
+        response = _SESSION.get(url, timeout=30)
         response.raise_for_status()
         
         with open(font_path, 'wb') as f:
@@ -304,6 +365,11 @@ def initialize_fonts():
         if not font_path or not os.path.exists(font_path):
             download_font(font_name)
     
+    # Warm the font cache at the common 1080p sizes so the first frame
+    # doesn't pay for FreeType parsing the TTF
+    for size in (FONT_SIZE_LYRICS, FONT_SIZE_TITLE, FONT_SIZE_ARTIST, FONT_SIZE_COUNTDOWN):
+        get_font(size)
+    
     _fonts_initialized = True
     print("✅ Fonts initialized")
 
@@ -342,7 +408,7 @@ def get_font(size, font_name='arial'):
 def convert_to_wav(input_path, output_path, sample_rate=SAMPLE_RATE):
     """Convert any audio file to WAV using FFmpeg"""
     cmd = [
-        'ffmpeg', '-y', '-i', input_path,
+        'ffmpeg', '-loglevel', 'error', '-nostats', '-y', '-i', input_path,
         '-ar', str(sample_rate),
         '-ac', '2',
         '-c:a', 'pcm_s16le',
@@ -352,14 +418,70 @@ def convert_to_wav(input_path, output_path, sample_rate=SAMPLE_RATE):
     return output_path
 
 
+# Duration cache keyed by (path, mtime) so repeat probes of a file are free
+_audio_duration_cache = {}
+
+
+def _wav_duration(audio_path):
+    """Read WAV duration straight from the RIFF header - no subprocess spawn."""
+    try:
+        with open(audio_path, 'rb') as f:
+            riff = f.read(12)
+            if riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+                return None
+            byte_rate = None
+            while True:
+                header = f.read(8)
+                if len(header) < 8:
+                    return None
+                chunk_id = header[:4]
+                chunk_size = int.from_bytes(header[4:8], 'little')
+                if chunk_id == b'fmt ':
+                    fmt = f.read(chunk_size)
+                    byte_rate = int.from_bytes(fmt[8:12], 'little')
+                elif chunk_id == b'data':
+                    if byte_rate:
+                        return chunk_size / byte_rate
+                    return None
+                else:
+                    # Skip unknown chunk (chunks are word-aligned)
+                    f.seek(chunk_size + (chunk_size & 1), 1)
+    except (OSError, IndexError):
+        return None
+
+
 def get_audio_duration(audio_path):
     """Get duration of audio file in seconds"""
-    result = subprocess.run(
-        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', 
-         '-of', 'default=noprint_wrappers=1:nokey=1', audio_path],
-        capture_output=True, text=True
-    )
-    return float(result.stdout.strip())
+    cache_key = (audio_path, os.path.getmtime(audio_path))
+    if cache_key in _audio_duration_cache:
+        return _audio_duration_cache[cache_key]
+
+    # Fast path: WAVs we produced ourselves carry the duration in the header
+    duration = None
+    if audio_path.endswith('.wav'):
+        duration = _wav_duration(audio_path)
+
+    if duration is None:
+        # torchaudio reads just the header for common containers - no
+        # ffprobe fork/exec needed
+        try:
+            info = torchaudio.info(audio_path)
+            if info.num_frames > 0 and info.sample_rate:
+                duration = info.num_frames / info.sample_rate
+        except Exception:
+            duration = None
+
+    if duration is None:
+        # ffprobe fallback for exotic containers
+        result = subprocess.run(
+            ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+             '-of', 'default=noprint_wrappers=1:nokey=1', audio_path],
+            capture_output=True, text=True
+        )
+        duration = float(result.stdout.strip())
+
+    _audio_duration_cache[cache_key] = duration
+    return duration
 
 
 def add_silence_to_audio(audio_path, silence_duration, output_path):
@@ -369,7 +491,7 @@ def add_silence_to_audio(audio_path, silence_duration, output_path):
     # Use FFmpeg to add silence at the beginning
     # This creates silence and concatenates it with the original audio
     cmd = [
-        'ffmpeg', '-y',
+        'ffmpeg', '-loglevel', 'error', '-nostats', '-y',
         '-f', 'lavfi', '-i', f'anullsrc=r=44100:cl=stereo:d={silence_duration}',
         '-i', audio_path,
         '-filter_complex', '[0:a][1:a]concat=n=2:v=0:a=1[out]',
@@ -387,6 +509,40 @@ def add_silence_to_audio(audio_path, silence_duration, output_path):
 _watermark_logo_cache = None
 _custom_watermark_cache = {}  # Cache custom watermarks by URL
 
+# Lookup table for scaling the logo alpha channel by WATERMARK_OPACITY
+_OPACITY_LUT = [int(p * WATERMARK_OPACITY) for p in range(256)]
+
+# On-disk cache of processed watermark logos so new workers skip both the
+# download and the resize/opacity work
+_WATERMARK_DISK_CACHE = os.path.join(tempfile.gettempdir(), 'vocalize_wm')
+
+def _watermark_cache_path(url):
+    return os.path.join(_WATERMARK_DISK_CACHE, hashlib.sha1(url.encode()).hexdigest() + '.png')
+
+def _load_cached_watermark(url):
+    """Load a previously processed watermark from the disk cache, if present."""
+    cache_path = _watermark_cache_path(url)
+    if os.path.exists(cache_path):
+        try:
+            return Image.open(cache_path).convert('RGBA')
+        except Exception:
+            pass
+    return None
+
+def _save_cached_watermark(url, logo):
+    """Persist a processed watermark to the disk cache (best-effort)."""
+    try:
+        os.makedirs(_WATERMARK_DISK_CACHE, exist_ok=True)
+        logo.save(_watermark_cache_path(url))
+    except Exception:
+        pass
+
+def _apply_opacity(logo):
+    """Scale an RGBA logo's alpha channel by WATERMARK_OPACITY (done once at load)."""
+    r, g, b, a = logo.split()
+    a = a.point(_OPACITY_LUT)
+    return Image.merge('RGBA', (r, g, b, a))
+
 def get_watermark_logo():
     """Download and cache the watermark logo"""
     global _watermark_logo_cache
@@ -397,21 +553,32 @@ def get_watermark_logo():
     if not WATERMARK_LOGO_URL:
         print("   ⚠️ No watermark logo URL configured")
         return None
-    
+
+    cached = _load_cached_watermark(WATERMARK_LOGO_URL)
+    if cached is not None:
+        _watermark_logo_cache = cached
+        print("   ✅ Watermark logo loaded from disk cache")
+        return cached
+
     try:
         print(f"   📥 Downloading watermark logo from {WATERMARK_LOGO_URL}")
-        response = requests.get(WATERMARK_LOGO_URL)
+        response = _SESSION.get(WATERMARK_LOGO_URL)
         response.raise_for_status()
         
         from io import BytesIO
         logo = Image.open(BytesIO(response.content)).convert('RGBA')
-        
+
         # Resize logo to standard width, keeping aspect ratio
         aspect_ratio = logo.height / logo.width
         new_width = WATERMARK_LOGO_SIZE
         new_height = int(new_width * aspect_ratio)
         logo = logo.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
+
+        # Bake the watermark opacity into the alpha channel once (LUT-based
+        # point), so per-frame compositing is a plain paste
+        logo = _apply_opacity(logo)
+        _save_cached_watermark(WATERMARK_LOGO_URL, logo)
+
         _watermark_logo_cache = logo
         print(f"   ✅ Watermark logo loaded ({new_width}x{new_height})")
         return logo
@@ -430,10 +597,16 @@ def get_custom_watermark(url):
     
     if url in _custom_watermark_cache:
         return _custom_watermark_cache[url]
-    
+
+    cached = _load_cached_watermark(url)
+    if cached is not None:
+        _custom_watermark_cache[url] = cached
+        print("   ✅ Custom watermark loaded from disk cache")
+        return cached
+
     try:
         print(f"   📥 Downloading custom watermark from {url}")
-        response = requests.get(url)
+        response = _SESSION.get(url)
         response.raise_for_status()
         
         from io import BytesIO
@@ -452,7 +625,11 @@ def get_custom_watermark(url):
             new_width = int(new_height / aspect_ratio)
         
         logo = logo.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
+
+        # Bake opacity in once so per-frame compositing is a plain paste
+        logo = _apply_opacity(logo)
+        _save_cached_watermark(url, logo)
+
         _custom_watermark_cache[url] = logo
         print(f"   ✅ Custom watermark loaded ({new_width}x{new_height})")
         return logo
@@ -462,59 +639,65 @@ def get_custom_watermark(url):
         return None
 
 
-def apply_watermark(frame, video_width, video_height):
-    """Apply watermark (logo at bottom-left, text at bottom-center) to frame"""
-    
-    # Get logo
-    logo = get_watermark_logo()
-    
-    # Create a copy of the frame to work with
-    watermarked = frame.copy()
-    
-    # Prepare to draw text
-    draw = ImageDraw.Draw(watermarked)
+# Fully composited watermark overlay (logo + text + outline), keyed by frame size
+_watermark_overlay_cache = {}
+
+def _get_watermark_overlay(video_width, video_height):
+    """Build the free-tier watermark overlay once per frame size."""
+    key = (video_width, video_height)
+    overlay = _watermark_overlay_cache.get(key)
+    if overlay is not None:
+        return overlay
+
+    overlay = Image.new('RGBA', (video_width, video_height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(overlay)
     font = get_font(20)  # Smaller font for watermark text
-    
+
     # Calculate text size
     text_bbox = draw.textbbox((0, 0), WATERMARK_TEXT, font=font)
     text_width = text_bbox[2] - text_bbox[0]
     text_height = text_bbox[3] - text_bbox[1]
-    
+
     # Bottom margin for both logo and text
     bottom_margin = WATERMARK_PADDING + 15  # Safe margin from bottom edge
-    
+
+    logo = get_watermark_logo()
     if logo:
         # Position logo at bottom-left
         logo_x = WATERMARK_PADDING
         logo_y = video_height - bottom_margin - logo.height
-        
-        # Create semi-transparent version of logo
-        logo_with_opacity = logo.copy()
-        alpha = logo_with_opacity.split()[3]
-        alpha = alpha.point(lambda p: int(p * WATERMARK_OPACITY))
-        logo_with_opacity.putalpha(alpha)
-        
-        # Paste logo onto frame
-        watermarked.paste(logo_with_opacity, (logo_x, logo_y), logo_with_opacity)
-    
+        overlay.paste(logo, (logo_x, logo_y), logo)
+
     # Position text at BOTTOM CENTER
     text_x = (video_width - text_width) // 2  # Center horizontally
     text_y = video_height - bottom_margin - text_height  # Same bottom margin as logo
-    
+
     # Draw text with slight transparency effect (draw outline then text)
     # Semi-transparent white text
     text_color = (255, 255, 255, int(255 * WATERMARK_OPACITY))
     outline_color = (0, 0, 0, int(255 * WATERMARK_OPACITY))
-    
+
     # Draw outline
     for dx in [-1, 0, 1]:
         for dy in [-1, 0, 1]:
             if dx != 0 or dy != 0:
                 draw.text((text_x + dx, text_y + dy), WATERMARK_TEXT, font=font, fill=outline_color)
-    
+
     # Draw main text
     draw.text((text_x, text_y), WATERMARK_TEXT, font=font, fill=text_color)
-    
+
+    _watermark_overlay_cache[key] = overlay
+    return overlay
+
+
+def apply_watermark(frame, video_width, video_height):
+    """Apply watermark (logo at bottom-left, text at bottom-center) to frame"""
+    overlay = _get_watermark_overlay(video_width, video_height)
+
+    # Single C-level alpha composite per frame - all layout and text
+    # rendering happened once when the overlay was built
+    watermarked = frame.copy()
+    watermarked.paste(overlay, (0, 0), overlay)
     return watermarked
 
 
@@ -532,31 +715,56 @@ def apply_studio_watermark(frame, video_width, video_height, custom_watermark_ur
     padding = 40  # Larger padding for custom watermarks
     logo_x = video_width - padding - logo.width
     logo_y = video_height - padding - logo.height
-    
-    # Create semi-transparent version
-    logo_with_opacity = logo.copy()
-    alpha = logo_with_opacity.split()[3]
-    alpha = alpha.point(lambda p: int(p * WATERMARK_OPACITY))
-    logo_with_opacity.putalpha(alpha)
-    
-    # Paste logo onto frame
-    watermarked.paste(logo_with_opacity, (logo_x, logo_y), logo_with_opacity)
+
+    # Paste logo onto frame (opacity already baked in at load time)
+    watermarked.paste(logo, (logo_x, logo_y), logo)
     
     return watermarked
 
 
+# Demucs singleton - loading ~80MB of weights and pushing them to the GPU
+# once at cold start instead of on every job
+_demucs_model = None
+
+
+def _get_demucs():
+    """Return the shared Demucs model, loading it on first use."""
+    global _demucs_model
+    if _demucs_model is None:
+        model = get_model(DEMUCS_MODEL)
+        model.eval()
+        if torch.cuda.is_available():
+            model.cuda()
+        _demucs_model = model
+    return _demucs_model
+
+
+def _save_wav_16bit(path, tensor, sample_rate=SAMPLE_RATE):
+    """Write a float tensor as 16-bit PCM - half the bytes of the fp32 default."""
+    torchaudio.save(path, tensor.clamp_(-1.0, 1.0), sample_rate,
+                    encoding='PCM_S', bits_per_sample=16)
+
+
 def separate_vocals(audio_path, output_dir):
     """Use Demucs to separate vocals from instrumental"""
     print("🎵 Separating vocals with Demucs...")
     
-    wav_input_path = os.path.join(output_dir, 'input_converted.wav')
-    convert_to_wav(audio_path, wav_input_path)
+    # Skip the ffmpeg transcode when the input is already in the format
+    # Demucs wants - a header probe instead of a full decode+reencode pass
+    wav_input_path = audio_path
+    try:
+        info = torchaudio.info(audio_path)
+        needs_convert = not (audio_path.endswith('.wav')
+                             and info.sample_rate == SAMPLE_RATE
+                             and info.num_channels == 2)
+    except Exception:
+        needs_convert = True
     
-    model = get_model(DEMUCS_MODEL)
-    model.eval()
+    if needs_convert:
+        wav_input_path = os.path.join(output_dir, 'input_converted.wav')
+        convert_to_wav(audio_path, wav_input_path)
     
-    if torch.cuda.is_available():
-        model.cuda()
+    model = _get_demucs()
     
     wav, sr = torchaudio.load(wav_input_path)
     
@@ -568,29 +776,58 @@ def separate_vocals(audio_path, output_dir):
         wav = wav.repeat(2, 1)
     
     wav = wav.unsqueeze(0)
-    
+
     if torch.cuda.is_available():
-        wav = wav.cuda()
-    
-    with torch.no_grad():
-        sources = apply_model(model, wav, device=wav.device)[0]
-    
-    sources = sources.cpu()
-    
+        # Pinned host memory makes the host-to-device copy asynchronous so
+        # it overlaps with the first segment's compute
+        wav = wav.pin_memory().to('cuda', non_blocking=True)
+
+    # autocast runs the conv/attention blocks in fp16 on tensor cores -
+    # about half the memory traffic; overlap-add stitching still happens
+    # in fp32 inside apply_model
+    with torch.no_grad(), torch.autocast(device_type='cuda', dtype=torch.float16,
+                                         enabled=torch.cuda.is_available()):
+        # split=True windows the track through the model segment-by-segment
+        # (overlap-added), capping peak VRAM instead of one full-length pass
+        sources = apply_model(model, wav, device=wav.device,
+                              split=True, overlap=0.25, progress=False)[0]
+    sources = sources.float()
+
+    # Sum the instrumental stems on-device where memory bandwidth is far
+    # higher, then copy only the two tensors we keep - half the PCIe
+    # traffic of moving all four stems to the host first
+    if sources.is_cuda:
+        # Pinned destination buffers let the two D2H copies run on the copy
+        # engine concurrently instead of serializing through pageable memory
+        vocals = torch.empty(sources[3].shape, pin_memory=True)
+        vocals.copy_(sources[3], non_blocking=True)
+        instrumental_gpu = sources[:3].sum(dim=0)
+        instrumental = torch.empty(instrumental_gpu.shape, pin_memory=True)
+        instrumental.copy_(instrumental_gpu, non_blocking=True)
+        torch.cuda.synchronize()
+        del instrumental_gpu
+    else:
+        vocals = sources[3]
+        instrumental = sources[:3].sum(dim=0)
+    del sources
+
     vocals_path = os.path.join(output_dir, 'vocals.wav')
     instrumental_path = os.path.join(output_dir, 'instrumental.wav')
-    
-    vocals = sources[3]
-    torchaudio.save(vocals_path, vocals, SAMPLE_RATE)
-    
-    instrumental = sources[0] + sources[1] + sources[2]
-    torchaudio.save(instrumental_path, instrumental, SAMPLE_RATE)
-    
-    # Free memory
-    del model, wav, sources
+
+    # WAV encoding is I/O-bound and releases the GIL, so write both stems
+    # concurrently instead of back-to-back
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        save_futures = [
+            executor.submit(_save_wav_16bit, vocals_path, vocals),
+            executor.submit(_save_wav_16bit, instrumental_path, instrumental),
+        ]
+        for future in save_futures:
+            future.result()
+
+    # Free the per-job tensors; the model stays resident and the CUDA
+    # allocator reuses its cached blocks on the next job
+    del wav, vocals, instrumental
     gc.collect()
-    if torch.cuda.is_available():
-        torch.cuda.empty_cache()
     
     print("✅ Vocal separation complete")
     return instrumental_path, vocals_path
@@ -600,7 +837,46 @@ def separate_vocals(audio_path, output_dir):
 # ASSEMBLYAI TRANSCRIPTION - PRECISE TIMING
 # ============================================
 
-def transcribe_with_assemblyai(audio_path, user_lyrics_text=None):
+def _read_in_chunks(f, chunk_size=1024 * 1024):
+    """Yield large chunks from a file so uploads stream instead of buffering."""
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+def _trim_vocal_silence(vocals_path, output_dir, threshold=0.01, min_saving=10.0):
+    """Cut silent lead/tail off the vocals before transcription.
+
+    Long instrumental intros and outros are pure silence in the vocals stem,
+    but AssemblyAI still transcribes (and bills) them. Returns
+    (trimmed_path, lead_seconds), or (None, 0.0) when there isn't enough
+    silence to be worth a separate upload.
+    """
+    try:
+        wav, sr = torchaudio.load(vocals_path)
+    except Exception:
+        return None, 0.0
+
+    active = wav.abs().max(dim=0).values > threshold
+    if not bool(active.any()):
+        return None, 0.0
+
+    idx = active.nonzero()
+    first = int(idx[0])
+    last = int(idx[-1]) + 1
+    saved = (first + (wav.shape[1] - last)) / sr
+    if saved < min_saving:
+        return None, 0.0
+
+    trimmed_path = os.path.join(output_dir, 'vocals_trimmed.wav')
+    _save_wav_16bit(trimmed_path, wav[:, first:last], sr)
+    print(f"   ✂️ Trimmed {saved:.1f}s of silence from vocals before transcription")
+    return trimmed_path, first / sr
+
+
+def transcribe_with_assemblyai(audio_path, user_lyrics_text=None, audio_url=None):
     """
     Use AssemblyAI for precise word-level timestamps.
     
@@ -608,6 +884,9 @@ def transcribe_with_assemblyai(audio_path, user_lyrics_text=None):
     - ~50ms word-level accuracy
     - No dependency conflicts
     - Production-grade reliability
+    
+    If audio_url is given (e.g. the vocals already sitting on R2), AssemblyAI
+    fetches it directly and the upload step is skipped entirely.
     """
     print("📝 Transcribing with AssemblyAI (precise alignment)...")
     
@@ -619,17 +898,20 @@ def transcribe_with_assemblyai(audio_path, user_lyrics_text=None):
         "content-type": "application/json"
     }
     
-    # Step 1: Upload audio file to AssemblyAI
-    print("   Uploading audio to AssemblyAI...")
-    with open(audio_path, 'rb') as f:
-        upload_response = requests.post(
-            ASSEMBLYAI_UPLOAD_URL,
-            headers={"authorization": ASSEMBLYAI_API_KEY},
-            data=f
-        )
-    upload_response.raise_for_status()
-    audio_url = upload_response.json()['upload_url']
-    print(f"   Audio uploaded: {audio_url[:50]}...")
+    # Step 1: Upload audio file to AssemblyAI (unless we already have a URL)
+    if audio_url is None:
+        print("   Uploading audio to AssemblyAI...")
+        with open(audio_path, 'rb') as f:
+            upload_response = _SESSION.post(
+                ASSEMBLYAI_UPLOAD_URL,
+                headers={"authorization": ASSEMBLYAI_API_KEY},
+                data=_read_in_chunks(f)
+            )
+        upload_response.raise_for_status()
+        audio_url = upload_response.json()['upload_url']
+        print(f"   Audio uploaded: {audio_url[:50]}...")
+    else:
+        print(f"   Using already-uploaded audio: {audio_url[:50]}...")
     
     # Step 2: Request transcription with word-level timestamps
     print("   Requesting transcription...")
@@ -639,7 +921,7 @@ def transcribe_with_assemblyai(audio_path, user_lyrics_text=None):
         "boost_param": "default"
     }
     
-    transcript_response = requests.post(
+    transcript_response = _SESSION.post(
         ASSEMBLYAI_TRANSCRIPT_URL,
         headers=headers,
         json=transcript_request
@@ -648,12 +930,14 @@ def transcribe_with_assemblyai(audio_path, user_lyrics_text=None):
     transcript_id = transcript_response.json()['id']
     print(f"   Transcript ID: {transcript_id}")
     
-    # Step 3: Poll for completion
+    # Step 3: Poll for completion - start fast so short songs aren't stuck
+    # waiting out a fixed 3s sleep, then back off toward 3s for long ones
     print("   Waiting for transcription to complete...")
     polling_url = f"{ASSEMBLYAI_TRANSCRIPT_URL}/{transcript_id}"
+    poll_delay = 0.3
     
     while True:
-        poll_response = requests.get(polling_url, headers=headers)
+        poll_response = _SESSION.get(polling_url, headers=headers)
         poll_response.raise_for_status()
         result = poll_response.json()
         
@@ -665,7 +949,8 @@ def transcribe_with_assemblyai(audio_path, user_lyrics_text=None):
             raise Exception(f"AssemblyAI transcription failed: {result.get('error', 'Unknown error')}")
         else:
             print(f"   Status: {status}...")
-            time.sleep(3)
+            time.sleep(poll_delay)
+            poll_delay = min(poll_delay * 1.5, 3.0)
     
     # Step 4: Extract word-level timestamps
     words = result.get('words', [])
@@ -743,28 +1028,24 @@ def align_user_lyrics_to_timestamps(user_lyrics_text, api_lyrics):
         return api_lyrics
 
 
+# Precompiled patterns for parse_lyrics_text - compiled once at import
+_SECTION_HEADER_RE = re.compile(r'\[.*?\]')  # [Verse 1], [Chorus], etc.
+_WORD_RE = re.compile(r'\S+')
+
+
 def parse_lyrics_text(lyrics_text):
     """Parse raw lyrics text into a clean list of words."""
-    # Remove section headers like [Verse 1], [Chorus], etc.
-    text = re.sub(r'\[.*?\]', '', lyrics_text)
-    text = ' '.join(text.split())
-    
-    words = []
-    for word in text.split():
-        cleaned = word.strip()
-        if cleaned and not cleaned.isspace():
-            words.append(cleaned)
-    
-    return words
+    # Strip section headers, then pull out every whitespace-delimited word
+    return _WORD_RE.findall(_SECTION_HEADER_RE.sub('', lyrics_text))
 
 
 def detect_silence_gaps(lyrics, intro_threshold=INTRO_COUNTDOWN_THRESHOLD, mid_threshold=COUNTDOWN_THRESHOLD):
     """Find gaps in lyrics where countdown should appear."""
     gaps = []
-    
+
     if not lyrics:
         return gaps
-    
+
     if lyrics[0]['start'] >= intro_threshold:
         gaps.append({
             'start': 0,
@@ -772,20 +1053,21 @@ def detect_silence_gaps(lyrics, intro_threshold=INTRO_COUNTDOWN_THRESHOLD, mid_t
             'duration': lyrics[0]['start'],
             'is_intro': True
         })
-    
-    for i in range(len(lyrics) - 1):
-        gap_start = lyrics[i]['end']
-        gap_end = lyrics[i + 1]['start']
-        gap_duration = gap_end - gap_start
-        
-        if gap_duration >= mid_threshold:
-            gaps.append({
-                'start': gap_start,
-                'end': gap_end,
-                'duration': gap_duration,
-                'is_intro': False
-            })
-    
+
+    # Vectorized gap scan: one C-level subtraction instead of a Python
+    # loop over every word
+    starts = np.fromiter((w['start'] for w in lyrics), dtype=np.float64, count=len(lyrics))
+    ends = np.fromiter((w['end'] for w in lyrics), dtype=np.float64, count=len(lyrics))
+    gap_durations = starts[1:] - ends[:-1]
+
+    for i in np.nonzero(gap_durations >= mid_threshold)[0]:
+        gaps.append({
+            'start': float(ends[i]),
+            'end': float(starts[i + 1]),
+            'duration': float(gap_durations[i]),
+            'is_intro': False
+        })
+
     return gaps
 
 
@@ -797,20 +1079,13 @@ def calculate_lyrics_stats(lyrics, audio_duration):
     total_words = len(lyrics)
     duration_minutes = audio_duration / 60
     wpm = total_words / duration_minutes if duration_minutes > 0 else 0
-    
-    lines = []
-    current_line = []
-    for i, word in enumerate(lyrics):
-        current_line.append(word)
-        if i < len(lyrics) - 1:
-            gap = lyrics[i + 1]['start'] - word['end']
-            if gap > 1.0:
-                lines.append(current_line)
-                current_line = []
-    if current_line:
-        lines.append(current_line)
-    
-    avg_line_length = sum(len(line) for line in lines) / len(lines) if lines else WORDS_PER_LINE
+
+    # A line break happens wherever the gap to the next word exceeds 1s,
+    # so the average line length is just total words / number of segments
+    starts = np.fromiter((w['start'] for w in lyrics), dtype=np.float64, count=len(lyrics))
+    ends = np.fromiter((w['end'] for w in lyrics), dtype=np.float64, count=len(lyrics))
+    line_count = int(np.count_nonzero(starts[1:] - ends[:-1] > 1.0)) + 1
+    avg_line_length = total_words / line_count
     
     long_gaps = [g for g in detect_silence_gaps(lyrics) if g['duration'] > 3]
     has_clear_sections = len(long_gaps) >= 2
@@ -847,80 +1122,149 @@ def select_display_mode(lyrics, audio_duration, requested_mode='auto'):
 # VIDEO GENERATION
 # ============================================
 
-def create_frame(width, height, colors=None):
-    """Create a blank frame with optional gradient background"""
+# Rendered background cache - the gradient is identical for every frame of
+# a video, so fill it once per (size, colors) and hand out copies
+_bg_cache = {}
+
+
+def _bg_template(width, height, colors=None):
+    """Return the cached background image for these colors - do NOT draw on it."""
     if colors is None:
         colors = {'bg_1': COLOR_BG, 'bg_2': COLOR_BG, 'use_gradient': False}
-    
+
     bg_1 = colors.get('bg_1', COLOR_BG)
     bg_2 = colors.get('bg_2', COLOR_BG)
     use_gradient = colors.get('use_gradient', False)
-    
-    img = Image.new('RGB', (width, height), bg_1)
-    
+    direction = colors.get('gradient_direction', 'to bottom')
+
+    cache_key = (width, height, bg_1, bg_2, use_gradient, direction)
+    cached = _bg_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     if use_gradient and bg_1 != bg_2:
-        draw = ImageDraw.Draw(img)
-        direction = colors.get('gradient_direction', 'to bottom')
-        
-        # Create gradient
-        for i in range(height):
-            if direction in ['to bottom', 'to top']:
-                ratio = i / height if direction == 'to bottom' else (height - i) / height
-            else:
-                ratio = i / height  # Default to vertical
-            
-            r = int(bg_1[0] + (bg_2[0] - bg_1[0]) * ratio)
-            g = int(bg_1[1] + (bg_2[1] - bg_1[1]) * ratio)
-            b = int(bg_1[2] + (bg_2[2] - bg_1[2]) * ratio)
-            draw.line([(0, i), (width, i)], fill=(r, g, b))
-    
+        # Compute the whole gradient as one NumPy broadcast instead of a
+        # Python loop drawing a line per row
+        if direction == 'to top':
+            ratios = np.linspace(1, 0, height, dtype=np.float32)
+        else:
+            ratios = np.linspace(0, 1, height, dtype=np.float32)  # Default to vertical
+
+        top = np.asarray(bg_1, dtype=np.float32)
+        bottom = np.asarray(bg_2, dtype=np.float32)
+        rows = (top + (bottom - top) * ratios[:, None]).astype(np.uint8)
+        arr = np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+        img = Image.fromarray(arr, 'RGB')
+    else:
+        img = Image.new('RGB', (width, height), bg_1)
+
+    _bg_cache[cache_key] = img
     return img
 
 
+def create_frame(width, height, colors=None):
+    """Create a blank frame with optional gradient background"""
+    return _bg_template(width, height, colors).copy()
+
+
+# Reusable scratch frame - the lyrics builders repaint the whole background
+# every frame anyway, so resetting one image with paste() avoids allocating
+# a fresh width x height buffer per frame (24 MB each at 4K)
+_frame_scratch = None
+_frame_scratch_draw = None
+
+
+def _reusable_frame(width, height, colors=None):
+    """Return the scratch frame repainted with the background, ready to draw on."""
+    global _frame_scratch, _frame_scratch_draw
+    template = _bg_template(width, height, colors)
+    if _frame_scratch is None or _frame_scratch.size != template.size:
+        _frame_scratch = template.copy()
+        _frame_scratch_draw = ImageDraw.Draw(_frame_scratch)
+    else:
+        _frame_scratch.paste(template, (0, 0))
+    return _frame_scratch
+
+
+def _find_current_line(line_end_times, t):
+    """Index of the line being sung at time t, clamped to the last line."""
+    return min(bisect.bisect_left(line_end_times, t), len(line_end_times) - 1)
+
+
+# Text-measurement cache - the same words recur across thousands of frames,
+# so run FreeType layout for each (word, font) pair only once
+@functools.lru_cache(maxsize=32768)
+def _word_width(word, font_px, font_name):
+    """Rendered width in pixels of a word at the given font size (cached)."""
+    return int(get_font(font_px, font_name).getlength(word))
+
+
+@functools.lru_cache(maxsize=8192)
+def _line_layout(words, font_px, font_name):
+    """Advance widths and total width for a line of words, computed once."""
+    widths = tuple(_word_width(w + ' ', font_px, font_name) for w in words)
+    return widths, sum(widths)
+
+
 def draw_centered_text(draw, text, y, font, color, width, padding=PADDING_LEFT_RIGHT):
     """Draw centered text with padding"""
-    bbox = draw.textbbox((0, 0), text, font=font)
-    text_width = bbox[2] - bbox[0]
+    text_width = int(font.getlength(text))
     x = (width - text_width) // 2
     x = max(padding, x)
     draw.text((x, y), text, font=font, fill=color)
 
 
+# Memoized intro frames - the fade only produces a handful of visually
+# distinct frames once alpha is quantized, so render each just once
+_intro_frame_cache = {}
+
+
 def create_intro_frame(artist, title, frame_num, total_frames, width, height, colors=None):
     """Create intro screen frame with fade in/out."""
+    progress = frame_num / total_frames
+    if progress < 0.2:
+        alpha = progress / 0.2
+    elif progress > 0.8:
+        alpha = (1 - progress) / 0.2
+    else:
+        alpha = 1.0
+
+    # Quantize the fade to 1/32 steps - perceptually identical, but nearby
+    # frames now share an alpha value and reuse the same rendered frame
+    alpha = round(alpha * 32) / 32
+
+    cache_key = (artist, title, alpha, width, height,
+                 tuple(sorted(colors.items())) if colors else None)
+    cached = _intro_frame_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     img = create_frame(width, height, colors)
     draw = ImageDraw.Draw(img)
-    
+
     # Get colors or use defaults
     text_color = colors.get('text', COLOR_TEXT) if colors else COLOR_TEXT
     sung_color = colors.get('sung', COLOR_HIGHLIGHT) if colors else COLOR_HIGHLIGHT
     font_name = colors.get('font', 'arial') if colors else 'arial'
-    
+
     scale = width / 1920
     font_artist = get_font(int(FONT_SIZE_ARTIST * scale), font_name)
     font_title = get_font(int(FONT_SIZE_TITLE * scale), font_name)
-    
-    progress = frame_num / total_frames
-    if progress < 0.2:
-        alpha = progress / 0.2
-    elif progress > 0.8:
-        alpha = (1 - progress) / 0.2
-    else:
-        alpha = 1.0
-    
+
     def apply_alpha(color, a):
         return tuple(int(c * a) for c in color)
-    
-    draw_centered_text(draw, artist, height // 2 - int(60 * scale), 
+
+    draw_centered_text(draw, artist, height // 2 - int(60 * scale),
                        font_artist, apply_alpha(text_color, alpha), width)
-    
-    draw_centered_text(draw, title, height // 2 + int(40 * scale), 
+
+    draw_centered_text(draw, title, height // 2 + int(40 * scale),
                        font_title, apply_alpha(sung_color, alpha), width)
-    
+
+    _intro_frame_cache[cache_key] = img
     return img
 
 
-def create_countdown_frame_with_preview(countdown_time, width, height, lyrics, gap_end_time, display_mode, colors=None, total_dots=COUNTDOWN_DOTS):
+def create_countdown_frame_with_preview(countdown_time, width, height, lyrics, gap_end_time, display_mode, colors=None, total_dots=COUNTDOWN_DOTS, lines=None, line_end_times=None):
     """
     Create countdown frame with 6 dots ABOVE upcoming lyrics.
     
@@ -931,11 +1275,14 @@ def create_countdown_frame_with_preview(countdown_time, width, height, lyrics, g
     # First, create the lyrics frame using the same display mode the user chose
     # This ensures consistency with how lyrics will look when singing starts
     if display_mode == 'scroll':
-        img = create_scroll_frame(gap_end_time, lyrics, width, height, colors)
+        img = create_scroll_frame(gap_end_time, lyrics, width, height, colors,
+                                  lines=lines, line_end_times=line_end_times)
     elif display_mode == 'page':
-        img = create_page_frame(gap_end_time, lyrics, width, height, colors)
+        img = create_page_frame(gap_end_time, lyrics, width, height, colors,
+                                lines=lines, line_end_times=line_end_times)
     else:
-        img = create_overwrite_frame(gap_end_time, lyrics, width, height, colors)
+        img = create_overwrite_frame(gap_end_time, lyrics, width, height, colors,
+                                     lines=lines, line_end_times=line_end_times)
     
     draw = ImageDraw.Draw(img)
     
@@ -951,32 +1298,45 @@ def create_countdown_frame_with_preview(countdown_time, width, height, lyrics, g
     dots_lit = int(elapsed / COUNTDOWN_DOT_INTERVAL)
     dots_lit = max(0, min(total_dots, dots_lit))
     
-    # Draw the countdown dots - positioned at top of screen, ABOVE the lyrics
+    # Paste the pre-rendered dot bar - positioned at top of screen, ABOVE the lyrics
     dot_radius = int(12 * scale)
     dot_spacing = int(20 * scale)
     total_dots_width = (total_dots * dot_radius * 2) + ((total_dots - 1) * dot_spacing)
     dots_start_x = (width - total_dots_width) // 2
     dots_y = int(height * 0.12)  # 12% from top - well above the lyrics area
+    bar_padding = int(20 * scale)
     
     # Get background color for the dot background bar
     bg_color = colors.get('bg_1', COLOR_BG) if colors else COLOR_BG
     
-    # Draw a subtle background bar behind the dots for visibility
-    bar_padding = int(20 * scale)
-    bar_height = dot_radius * 2 + bar_padding * 2
-    bar_y = dots_y - bar_padding
-    
-    # Draw background bar (simple rectangle)
-    draw.rectangle(
-        [(dots_start_x - bar_padding, bar_y), 
-         (dots_start_x + total_dots_width + bar_padding, bar_y + bar_height)],
-        fill=bg_color
-    )
+    bar = _get_dot_bar(dots_lit, total_dots, dot_radius, dot_spacing,
+                       bar_padding, bg_color)
+    img.paste(bar, (dots_start_x - bar_padding, dots_y - bar_padding))
     
+    return img
+
+
+# Pre-rendered countdown dot bars - only total_dots + 1 of them ever exist for
+# a video, so draw the circles once and paste the strip every frame
+_dot_bar_cache = {}
+
+
+def _get_dot_bar(dots_lit, total_dots, dot_radius, dot_spacing, bar_padding, bg_color):
+    """Return the dot-countdown bar (bg strip + circles) with dots_lit dots lit."""
+    cache_key = (dots_lit, total_dots, dot_radius, dot_spacing, bar_padding, bg_color)
+    cached = _dot_bar_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    total_dots_width = (total_dots * dot_radius * 2) + ((total_dots - 1) * dot_spacing)
+    bar_height = dot_radius * 2 + bar_padding * 2
+    bar = Image.new('RGB', (total_dots_width + bar_padding * 2 + 1, bar_height + 1), bg_color)
+    draw = ImageDraw.Draw(bar)
+
     # Draw each dot as a circle (ellipse)
     for i in range(total_dots):
-        center_x = dots_start_x + dot_radius + i * (dot_radius * 2 + dot_spacing)
-        center_y = dots_y + dot_radius
+        center_x = bar_padding + dot_radius + i * (dot_radius * 2 + dot_spacing)
+        center_y = bar_padding + dot_radius
         
         if i < dots_lit:
             # Lit dot - gold/yellow filled
@@ -995,8 +1355,9 @@ def create_countdown_frame_with_preview(countdown_time, width, height, lyrics, g
             outline=outline_color,
             width=2
         )
-    
-    return img
+
+    _dot_bar_cache[cache_key] = bar
+    return bar
 
 
 def group_lyrics_into_lines(lyrics, words_per_line=WORDS_PER_LINE):
@@ -1039,40 +1400,70 @@ def group_lyrics_into_lines(lyrics, words_per_line=WORDS_PER_LINE):
     return lines
 
 
-def create_scroll_frame(current_time, lyrics, width, height, colors=None):
+def _draw_word_runs(draw, line, widths, x, y, font, color_fn, clip_x=None):
+    """Draw a line's words, merging consecutive same-color words into one call.
+
+    Uniform lines (all sung, all upcoming) collapse to a single draw.text;
+    only the line with a moving highlight boundary needs two or three runs.
+    color_fn maps a word index to its fill color.
+    """
+    run_start = 0
+    n = len(line)
+    while run_start < n:
+        color = color_fn(run_start)
+        run_end = run_start + 1
+        while run_end < n and color_fn(run_end) == color:
+            run_end += 1
+        run_w = sum(widths[run_start:run_end])
+        if clip_x is not None and x + run_w > clip_x:
+            # Run overflows: fall back to per-word so the clip boundary
+            # matches the old word-at-a-time behavior
+            word_x = x
+            for i in range(run_start, run_end):
+                if word_x + widths[i] <= clip_x:
+                    draw.text((word_x, y), line[i]['word'] + ' ', font=font, fill=color)
+                word_x += widths[i]
+        else:
+            text = ''.join(w['word'] + ' ' for w in line[run_start:run_end])
+            draw.text((x, y), text, font=font, fill=color)
+        x += run_w
+        run_start = run_end
+
+
+def create_scroll_frame(current_time, lyrics, width, height, colors=None, lines=None, line_end_times=None):
     """Create TELEPROMPTER-STYLE scrolling lyrics frame."""
-    img = create_frame(width, height, colors)
-    draw = ImageDraw.Draw(img)
+    img = _reusable_frame(width, height, colors)
+    draw = _frame_scratch_draw
     
     # Get colors or use defaults
     text_color = colors.get('text', COLOR_TEXT) if colors else COLOR_TEXT
     sung_color = colors.get('sung', COLOR_SUNG) if colors else COLOR_SUNG
     highlight_color = colors.get('sung', COLOR_HIGHLIGHT) if colors else COLOR_HIGHLIGHT
-    upcoming_color = colors.get('text', COLOR_UPCOMING) if colors else COLOR_UPCOMING
-    # Make upcoming slightly dimmer than main text
+    # Upcoming is slightly dimmer than main text; generate_video precomputes it
     if colors:
-        upcoming_color = tuple(int(c * 0.7) for c in text_color)
+        upcoming_color = colors.get('upcoming') or tuple(int(c * 0.7) for c in text_color)
+    else:
+        upcoming_color = COLOR_UPCOMING
     
     # Get font settings
     font_size_scale = colors.get('font_size_scale', 1.0) if colors else 1.0
     font_name = colors.get('font', 'arial') if colors else 'arial'
     
     scale = width / 1920
-    font = get_font(int(FONT_SIZE_LYRICS * scale * font_size_scale), font_name)
+    font_px = int(FONT_SIZE_LYRICS * scale * font_size_scale)
+    font = get_font(font_px, font_name)
     line_height = int(FONT_SIZE_LYRICS * LINE_HEIGHT_MULTIPLIER * scale * font_size_scale)
     padding = int(PADDING_LEFT_RIGHT * scale)
     
-    lines = group_lyrics_into_lines(lyrics)
+    if lines is None:
+        lines = group_lyrics_into_lines(lyrics)
+    if line_end_times is None:
+        line_end_times = np.array([line[-1]['end'] for line in lines])
     
     if not lines:
         return img
     
-    current_line_idx = 0
-    for i, line in enumerate(lines):
-        if line and line[-1]['end'] >= current_time:
-            current_line_idx = i
-            break
-        current_line_idx = i
+    current_line_idx = _find_current_line(line_end_times, current_time)
     
     scroll_progress = 0
     if current_line_idx < len(lines):
@@ -1100,36 +1491,30 @@ def create_scroll_frame(current_time, lyrics, width, height, colors=None):
             if y < -line_height or y > height + line_height:
                 continue
             
-            total_width = sum(draw.textbbox((0, 0), w['word'] + ' ', font=font)[2] for w in line)
+            widths, total_width = _line_layout(
+                tuple(w['word'] for w in line), font_px, font_name)
             x = (width - total_width) // 2
             x = max(padding, x)
             
-            for word_data in line:
-                word = word_data['word'] + ' '
-                word_width = draw.textbbox((0, 0), word, font=font)[2]
-                
-                if line_idx < current_line_idx:
-                    color = sung_color
-                elif line_idx == current_line_idx:
-                    if current_time >= word_data['start']:
-                        color = highlight_color
-                    else:
-                        color = text_color
-                else:
-                    color = upcoming_color
-                
-                if x + word_width <= width - padding:
-                    draw.text((x, y), word, font=font, fill=color)
-                
-                x += word_width
+            if line_idx < current_line_idx:
+                color_fn = lambda i: sung_color
+            elif line_idx == current_line_idx:
+                color_fn = lambda i, line=line: (highlight_color
+                                                if current_time >= line[i]['start']
+                                                else text_color)
+            else:
+                color_fn = lambda i: upcoming_color
+            
+            _draw_word_runs(draw, line, widths, x, y, font, color_fn,
+                            clip_x=width - padding)
     
     return img
 
 
-def create_page_frame(current_time, lyrics, width, height, colors=None):
+def create_page_frame(current_time, lyrics, width, height, colors=None, lines=None, line_end_times=None):
     """Create frame with page-by-page lyrics display."""
-    img = create_frame(width, height, colors)
-    draw = ImageDraw.Draw(img)
+    img = _reusable_frame(width, height, colors)
+    draw = _frame_scratch_draw
     
     # Get colors or use defaults
     text_color = colors.get('text', COLOR_TEXT) if colors else COLOR_TEXT
@@ -1141,60 +1526,55 @@ def create_page_frame(current_time, lyrics, width, height, colors=None):
     font_name = colors.get('font', 'arial') if colors else 'arial'
     
     scale = width / 1920
-    font = get_font(int(FONT_SIZE_LYRICS * scale * font_size_scale), font_name)
+    font_px = int(FONT_SIZE_LYRICS * scale * font_size_scale)
+    font = get_font(font_px, font_name)
     line_height = int(FONT_SIZE_LYRICS * LINE_HEIGHT_MULTIPLIER * scale * font_size_scale)
     padding = int(PADDING_LEFT_RIGHT * scale)
     
-    lines = group_lyrics_into_lines(lyrics)
-    
-    pages = []
-    for i in range(0, len(lines), LINES_PER_PAGE):
-        pages.append(lines[i:i + LINES_PER_PAGE])
+    if lines is None:
+        lines = group_lyrics_into_lines(lyrics)
+    if line_end_times is None:
+        line_end_times = np.array([line[-1]['end'] for line in lines])
+
+    if not lines:
+        return img
+
+    current_line_idx = _find_current_line(line_end_times, current_time)
     
-    current_line_idx = 0
-    for i, line in enumerate(lines):
-        if line and line[-1]['end'] >= current_time:
-            current_line_idx = i
-            break
-        current_line_idx = i
+    # Slice just the current page out of lines - no need to materialize every
+    # page on every frame when only one is drawn
+    num_pages = (len(lines) + LINES_PER_PAGE - 1) // LINES_PER_PAGE
+    current_page_idx = min(current_line_idx // LINES_PER_PAGE, num_pages - 1)
+    page_start = current_page_idx * LINES_PER_PAGE
+    page = lines[page_start:page_start + LINES_PER_PAGE]
     
-    current_page_idx = current_line_idx // LINES_PER_PAGE
-    current_page_idx = min(current_page_idx, len(pages) - 1)
+    total_height = len(page) * line_height
+    start_y = (height - total_height) // 2
     
-    if current_page_idx < len(pages):
-        page = pages[current_page_idx]
+    for i, line in enumerate(page):
+        y = start_y + (i * line_height)
+        line_idx_global = page_start + i
         
-        total_height = len(page) * line_height
-        start_y = (height - total_height) // 2
+        widths, total_width = _line_layout(
+            tuple(w['word'] for w in line), font_px, font_name)
+        x = (width - total_width) // 2
+        x = max(padding, x)
         
-        for i, line in enumerate(page):
-            y = start_y + (i * line_height)
-            line_idx_global = current_page_idx * LINES_PER_PAGE + i
-            
-            total_width = sum(draw.textbbox((0, 0), w['word'] + ' ', font=font)[2] for w in line)
-            x = (width - total_width) // 2
-            x = max(padding, x)
-            
-            for word_data in line:
-                word = word_data['word'] + ' '
-                
-                if line_idx_global < current_line_idx:
-                    color = sung_color
-                elif line_idx_global == current_line_idx:
-                    if current_time >= word_data['start']:
-                        color = highlight_color
-                    else:
-                        color = text_color
-                else:
-                    color = text_color
-                
-                draw.text((x, y), word, font=font, fill=color)
-                x += draw.textbbox((0, 0), word, font=font)[2]
+        if line_idx_global < current_line_idx:
+            color_fn = lambda i: sung_color
+        elif line_idx_global == current_line_idx:
+            color_fn = lambda i, line=line: (highlight_color
+                                             if current_time >= line[i]['start']
+                                             else text_color)
+        else:
+            color_fn = lambda i: text_color
+        
+        _draw_word_runs(draw, line, widths, x, y, font, color_fn)
     
     return img
 
 
-def create_overwrite_frame(current_time, lyrics, width, height, colors=None):
+def create_overwrite_frame(current_time, lyrics, width, height, colors=None, lines=None, line_end_times=None):
     """
     Create frame with TRUE overwrite-style lyrics display.
     
@@ -1206,40 +1586,40 @@ def create_overwrite_frame(current_time, lyrics, width, height, colors=None):
     When a line is done being sung, the NEXT line for that position
     appears instantly. Lines don't move - content is replaced in place.
     """
-    img = create_frame(width, height, colors)
-    draw = ImageDraw.Draw(img)
+    img = _reusable_frame(width, height, colors)
+    draw = _frame_scratch_draw
     
     # Get colors or use defaults
     text_color = colors.get('text', COLOR_TEXT) if colors else COLOR_TEXT
     sung_color = colors.get('sung', COLOR_SUNG) if colors else COLOR_SUNG
     highlight_color = colors.get('sung', COLOR_HIGHLIGHT) if colors else COLOR_HIGHLIGHT
-    upcoming_color = colors.get('text', COLOR_UPCOMING) if colors else COLOR_UPCOMING
-    # Make upcoming slightly dimmer than main text
+    # Upcoming is slightly dimmer than main text; generate_video precomputes it
     if colors:
-        upcoming_color = tuple(int(c * 0.7) for c in text_color)
+        upcoming_color = colors.get('upcoming') or tuple(int(c * 0.7) for c in text_color)
+    else:
+        upcoming_color = COLOR_UPCOMING
     
     # Get font settings
     font_size_scale = colors.get('font_size_scale', 1.0) if colors else 1.0
     font_name = colors.get('font', 'arial') if colors else 'arial'
     
     scale = width / 1920
-    font = get_font(int(FONT_SIZE_LYRICS * scale * font_size_scale), font_name)
+    font_px = int(FONT_SIZE_LYRICS * scale * font_size_scale)
+    font = get_font(font_px, font_name)
     line_height = int(FONT_SIZE_LYRICS * LINE_HEIGHT_MULTIPLIER * scale * font_size_scale)
     padding = int(PADDING_LEFT_RIGHT * scale)
     
     # Group lyrics into lines
-    lines = group_lyrics_into_lines(lyrics)
+    if lines is None:
+        lines = group_lyrics_into_lines(lyrics)
+    if line_end_times is None:
+        line_end_times = np.array([line[-1]['end'] for line in lines])
     
     if not lines:
         return img
     
     # Find which line is currently being sung
-    current_line_idx = 0
-    for i, line in enumerate(lines):
-        if line and line[-1]['end'] >= current_time:
-            current_line_idx = i
-            break
-        current_line_idx = i
+    current_line_idx = _find_current_line(line_end_times, current_time)
     
     NUM_POSITIONS = 3
     
@@ -1263,44 +1643,43 @@ def create_overwrite_frame(current_time, lyrics, width, height, colors=None):
         y = start_y + (position * line_height)
         
         # Calculate total width for centering
-        total_width = sum(draw.textbbox((0, 0), w['word'] + ' ', font=font)[2] for w in line)
+        widths, total_width = _line_layout(
+            tuple(w['word'] for w in line), font_px, font_name)
         x = (width - total_width) // 2
         x = max(padding, x)
         
-        # Draw each word in the line
-        for word_data in line:
-            word = word_data['word'] + ' '
-            
-            if line_idx < current_line_idx:
-                # Already sung (shouldn't happen with this logic, but just in case)
-                color = sung_color
-            elif line_idx == current_line_idx:
-                # Current line - highlight sung words
-                if current_time >= word_data['start']:
-                    color = highlight_color
-                else:
-                    color = text_color
-            else:
-                # Upcoming lines
-                color = upcoming_color
-            
-            draw.text((x, y), word, font=font, fill=color)
-            x += draw.textbbox((0, 0), word, font=font)[2]
+        # Draw the line, merging same-color words into single calls
+        if line_idx < current_line_idx:
+            # Already sung (shouldn't happen with this logic, but just in case)
+            color_fn = lambda i: sung_color
+        elif line_idx == current_line_idx:
+            # Current line - highlight sung words
+            color_fn = lambda i, line=line: (highlight_color
+                                             if current_time >= line[i]['start']
+                                             else text_color)
+        else:
+            # Upcoming lines
+            color_fn = lambda i: upcoming_color
+        
+        _draw_word_runs(draw, line, widths, x, y, font, color_fn)
     
     return img
 
 
-def create_lyrics_frame(current_time, lyrics, display_mode, width, height, colors=None):
+def create_lyrics_frame(current_time, lyrics, display_mode, width, height, colors=None, lines=None, line_end_times=None):
     """Create frame with lyrics based on selected display mode."""
     if display_mode == 'scroll':
-        return create_scroll_frame(current_time, lyrics, width, height, colors)
+        return create_scroll_frame(current_time, lyrics, width, height, colors,
+                                   lines=lines, line_end_times=line_end_times)
     elif display_mode == 'page':
-        return create_page_frame(current_time, lyrics, width, height, colors)
+        return create_page_frame(current_time, lyrics, width, height, colors,
+                                 lines=lines, line_end_times=line_end_times)
     else:
-        return create_overwrite_frame(current_time, lyrics, width, height, colors)
+        return create_overwrite_frame(current_time, lyrics, width, height, colors,
+                                      lines=lines, line_end_times=line_end_times)
 
 
-def create_lyrics_frame_with_fade(current_time, lyrics, display_mode, width, height, colors=None, fade_opacity=1.0):
+def create_lyrics_frame_with_fade(current_time, lyrics, display_mode, width, height, colors=None, fade_opacity=1.0, lines=None, line_end_times=None):
     """
     Create frame with lyrics that fades out.
     
@@ -1313,12 +1692,8 @@ def create_lyrics_frame_with_fade(current_time, lyrics, display_mode, width, hei
         return img  # Fully faded, just return background
     
     # Create the lyrics frame
-    if display_mode == 'scroll':
-        lyrics_frame = create_scroll_frame(current_time, lyrics, width, height, colors)
-    elif display_mode == 'page':
-        lyrics_frame = create_page_frame(current_time, lyrics, width, height, colors)
-    else:
-        lyrics_frame = create_overwrite_frame(current_time, lyrics, width, height, colors)
+    lyrics_frame = create_lyrics_frame(current_time, lyrics, display_mode, width, height, colors,
+                                       lines=lines, line_end_times=line_end_times)
     
     # Blend the lyrics frame with the background based on opacity
     if fade_opacity < 1.0:
@@ -1336,6 +1711,215 @@ def create_lyrics_frame_with_fade(current_time, lyrics, display_mode, width, hei
     return lyrics_frame
 
 
+# Hardware H.264 encoders in preference order. Detection runs a tiny test
+# encode because ffmpeg lists encoders it can't actually drive on this box.
+_HW_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_vaapi', 'h264_videotoolbox']
+_video_encoder = None
+
+
+def get_video_encoder():
+    """Pick the fastest working H.264 encoder, preferring hardware (cached)."""
+    global _video_encoder
+    if _video_encoder is not None:
+        return _video_encoder
+
+    override = os.environ.get('VIDEO_ENCODER')
+    if override:
+        _video_encoder = override
+        print(f"   🎞️ Video encoder (from VIDEO_ENCODER): {override}")
+        return override
+
+    for encoder in _HW_ENCODERS:
+        try:
+            probe = subprocess.run(
+                ['ffmpeg', '-hide_banner', '-f', 'lavfi', '-i', 'color=black:s=64x64:d=0.1',
+                 '-frames:v', '1', '-c:v', encoder, '-f', 'null', '-'],
+                capture_output=True, timeout=15
+            )
+        except Exception:
+            continue
+        if probe.returncode == 0:
+            _video_encoder = encoder
+            print(f"   🎞️ Using hardware encoder: {encoder}")
+            return encoder
+
+    _video_encoder = 'libx264'
+    return 'libx264'
+
+
+# x264 speed/quality per output tier - the low tiers are preview-class, so
+# trade some bitrate for a much faster software encode
+_X264_PRESETS = {'4k': 'fast', '1080p': 'medium', '720p': 'veryfast', '480p': 'ultrafast'}
+_X264_CRF = {'480p': '28'}
+
+
+def _video_codec_args(video_quality='1080p'):
+    """FFmpeg video codec arguments for the selected encoder."""
+    encoder = get_video_encoder()
+    if encoder == 'h264_nvenc':
+        return ['-c:v', 'h264_nvenc', '-preset', 'p4', '-tune', 'hq',
+                '-rc', 'vbr', '-cq', '23', '-b:v', '0']
+    if encoder == 'libx264':
+        return ['-c:v', 'libx264',
+                '-preset', _X264_PRESETS.get(video_quality, 'medium'),
+                '-crf', _X264_CRF.get(video_quality, '23')]
+    return ['-c:v', encoder]
+
+
+# Per-worker render context, installed once per pool process by the initializer
+_RENDER_CTX = None
+
+# Last rendered frame per worker: page/overwrite/countdown/intro frames hold
+# the same visual state for many consecutive frames, so one slot catches
+# nearly every duplicate without holding gigabytes of frame bytes
+_last_frame_key = None
+_last_frame_bytes = None
+
+
+def _init_render_worker(ctx):
+    global _RENDER_CTX, _last_frame_key, _last_frame_bytes
+    global _frame_scratch, _frame_scratch_draw
+    _RENDER_CTX = ctx
+    _last_frame_key = None
+    _last_frame_bytes = None
+    _frame_scratch = None
+    _frame_scratch_draw = None
+    # Watermark art was resolved in the parent and travels in the ctx -
+    # seed the caches so no worker ever touches the network (the forked
+    # _SESSION shares the parent's sockets and is not fork-safe)
+    if ctx['apply_watermark'] and ctx.get('watermark_overlay') is not None:
+        _watermark_overlay_cache[(ctx['width'], ctx['height'])] = ctx['watermark_overlay']
+    if ctx['custom_watermark_url']:
+        _custom_watermark_cache[ctx['custom_watermark_url']] = ctx.get('custom_watermark_logo')
+
+
+def _frame_state_key(ctx, frame_num, current_time):
+    """Summarize what a frame will look like; equal keys render identically.
+
+    Returns None when the frame changes continuously (scroll mode, fadeout)
+    and must always be rendered.
+    """
+    if frame_num < ctx['intro_frames']:
+        progress = frame_num / ctx['intro_frames']
+        if progress < 0.2:
+            alpha = progress / 0.2
+        elif progress > 0.8:
+            alpha = (1 - progress) / 0.2
+        else:
+            alpha = 1.0
+        return ('intro', round(alpha * 32) / 32)
+
+    for gap in ctx['offset_gaps']:
+        if gap['countdown_start'] <= current_time < gap['end']:
+            # Preview lyrics are rendered at the fixed gap end time, so the
+            # frame only changes when another dot lights up
+            elapsed = (COUNTDOWN_DOTS * COUNTDOWN_DOT_INTERVAL) - (gap['end'] - current_time)
+            dots_lit = max(0, min(COUNTDOWN_DOTS, int(elapsed / COUNTDOWN_DOT_INTERVAL)))
+            return ('countdown', gap['end'], dots_lit)
+
+    if current_time >= ctx['fadeout_start']:
+        return None
+
+    lines = ctx['lines']
+    if not lines:
+        return ('static',)
+
+    # Frames only change when the current line advances or another word in
+    # it lights up...
+    current_line_idx = _find_current_line(ctx['line_end_times'], current_time)
+    sung_words = sum(1 for w in lines[current_line_idx] if current_time >= w['start'])
+
+    if ctx['display_mode'] == 'scroll':
+        # ...or, for scroll mode, when the integer pixel offset moves - the
+        # sub-pixel progress between two offsets renders identically
+        line = lines[current_line_idx]
+        scroll_progress = 0.0
+        if line and line[-1]['end'] > line[0]['start']:
+            scroll_progress = ((current_time - line[0]['start'])
+                               / (line[-1]['end'] - line[0]['start']))
+            scroll_progress = max(0.0, min(1.0, scroll_progress))
+        font_size_scale = ctx['colors'].get('font_size_scale', 1.0) if ctx['colors'] else 1.0
+        line_height = int(FONT_SIZE_LYRICS * LINE_HEIGHT_MULTIPLIER
+                          * (ctx['width'] / 1920) * font_size_scale)
+        return ('scroll', current_line_idx, int(scroll_progress * line_height), sung_words)
+
+    return (ctx['display_mode'], current_line_idx, sung_words)
+
+
+def _render_frame(frame_num):
+    """Render a single video frame and return its raw RGB bytes (pool worker body)."""
+    global _last_frame_key, _last_frame_bytes
+    ctx = _RENDER_CTX
+    current_time = frame_num / FPS
+
+    state_key = _frame_state_key(ctx, frame_num, current_time)
+    if state_key is not None and state_key == _last_frame_key:
+        return _last_frame_bytes
+
+    if frame_num < ctx['intro_frames']:
+        # Show intro screen during the silence period
+        frame = create_intro_frame(ctx['artist'], ctx['title'], frame_num,
+                                   ctx['intro_frames'], ctx['width'], ctx['height'],
+                                   ctx['colors'])
+    else:
+        # Check if we're in a countdown period
+        frame = None
+        for gap in ctx['offset_gaps']:
+            if gap['countdown_start'] <= current_time < gap['end']:
+                frame = create_countdown_frame_with_preview(
+                    gap['end'] - current_time,
+                    ctx['width'],
+                    ctx['height'],
+                    ctx['offset_lyrics'],
+                    gap['end'],
+                    ctx['display_mode'],
+                    ctx['colors'],
+                    lines=ctx['lines'],
+                    line_end_times=ctx['line_end_times']
+                )
+                break
+
+        if frame is None:
+            if current_time >= ctx['fadeout_start']:
+                # Calculate fade opacity (1.0 at start, 0.0 at end)
+                fade_progress = min(1.0, (current_time - ctx['fadeout_start']) / FADEOUT_DURATION)
+                frame = create_lyrics_frame_with_fade(
+                    current_time,
+                    ctx['offset_lyrics'],
+                    ctx['display_mode'],
+                    ctx['width'],
+                    ctx['height'],
+                    ctx['colors'],
+                    1.0 - fade_progress,
+                    lines=ctx['lines'],
+                    line_end_times=ctx['line_end_times']
+                )
+            else:
+                # Normal lyrics display
+                frame = create_lyrics_frame(current_time, ctx['offset_lyrics'],
+                                            ctx['display_mode'], ctx['width'], ctx['height'],
+                                            ctx['colors'], lines=ctx['lines'],
+                                            line_end_times=ctx['line_end_times'])
+
+    # Apply watermark for free tier, or custom watermark for Studio
+    if ctx['apply_watermark']:
+        frame = apply_watermark(frame, ctx['width'], ctx['height'])
+    elif ctx['custom_watermark_url']:
+        frame = apply_studio_watermark(frame, ctx['width'], ctx['height'],
+                                       ctx['custom_watermark_url'])
+
+    frame_bytes = frame.tobytes()
+    if state_key is not None:
+        _last_frame_key = state_key
+        _last_frame_bytes = frame_bytes
+    return frame_bytes
+
+
+def _render_chunk(start, count):
+    """Render a contiguous run of frames in one pool task (pool worker body)."""
+    return [_render_frame(i) for i in range(start, start + count)]
+
+
 def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_quality, display_mode, style_options=None, subscription_tier='free', custom_watermark_url=None):
     """Generate video with lyrics and countdown"""
     print(f"🎬 Generating video (mode: {display_mode})...")
@@ -1371,8 +1955,7 @@ def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_qual
     
     # Parse colors from hex to RGB tuples
     def hex_to_rgb(hex_color):
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+        return tuple(bytes.fromhex(hex_color.lstrip('#')))
     
     # Font size scale mapping
     font_size_scales = {
@@ -1388,6 +1971,8 @@ def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_qual
         'text': hex_to_rgb(style_options.get('text_color', '#ffffff')),
         'outline': hex_to_rgb(style_options.get('outline_color', '#000000')),
         'sung': hex_to_rgb(style_options.get('sung_color', '#00d4ff')),
+        # Dimmed "upcoming" shade, computed once instead of per frame
+        'upcoming': tuple(int(c * 0.7) for c in hex_to_rgb(style_options.get('text_color', '#ffffff'))),
         'use_gradient': style_options.get('use_gradient', True),
         'gradient_direction': style_options.get('gradient_direction', 'to bottom'),
         'font_size_scale': font_size_scale,
@@ -1405,19 +1990,19 @@ def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_qual
     else:
         width, height = 1280, 720  # Default to 720p
     
-    # Add silence to beginning of audio for intro screen
+    # Add silence to beginning of audio for intro screen (the handler may
+    # have already produced this while transcription was running)
     work_dir = os.path.dirname(audio_path)
     audio_with_intro = os.path.join(work_dir, 'audio_with_intro.wav')
-    add_silence_to_audio(audio_path, INTRO_DURATION, audio_with_intro)
+    if not os.path.exists(audio_with_intro):
+        add_silence_to_audio(audio_path, INTRO_DURATION, audio_with_intro)
     
     # Offset all lyric timestamps by INTRO_DURATION
     # So lyrics sync with audio that now has silence at the start
-    offset_lyrics = []
-    for word in lyrics:
-        offset_word = word.copy()
-        offset_word['start'] = word['start'] + INTRO_DURATION
-        offset_word['end'] = word['end'] + INTRO_DURATION
-        offset_lyrics.append(offset_word)
+    offset_lyrics = [{**word,
+                      'start': word['start'] + INTRO_DURATION,
+                      'end': word['end'] + INTRO_DURATION}
+                     for word in lyrics]
     
     print(f"   ⏱️ Lyrics offset by {INTRO_DURATION}s for intro")
     
@@ -1425,8 +2010,6 @@ def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_qual
     total_duration = get_audio_duration(audio_with_intro)
     total_frames = int(total_duration * FPS)
     
-    frames_dir = tempfile.mkdtemp()
-    
     artist = track_info.get('artist_name', 'Unknown Artist')
     title = track_info.get('song_title', 'Unknown Title')
     
@@ -1485,102 +2068,138 @@ def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_qual
     if offset_lyrics:
         print(f"      First lyric '{offset_lyrics[0]['word']}' at {offset_lyrics[0]['start']:.2f}s (frame {int(offset_lyrics[0]['start'] * FPS)})")
     
-    first_lyric_logged = False
-    countdown_gaps_logged = set()  # Track which gaps we've logged
-    
-    for frame_num in range(total_frames):
-        current_time = frame_num / FPS
-        
-        if frame_num < intro_frames:
-            # Show intro screen during the silence period
-            frame = create_intro_frame(artist, title, frame_num, intro_frames, width, height, colors)
-        else:
-            # Check if we're in a countdown period
-            in_countdown = False
-            for gap_idx, gap in enumerate(offset_gaps):
-                countdown_start = gap.get('countdown_start', gap['end'] - (COUNTDOWN_DOTS * COUNTDOWN_DOT_INTERVAL))
-                if countdown_start <= current_time < gap['end']:
-                    # We're in a countdown period
-                    in_countdown = True
-                    countdown_remaining = gap['end'] - current_time
-                    
-                    # Debug: Log first time we enter this countdown gap
-                    if gap_idx not in countdown_gaps_logged:
-                        print(f"   🔵 COUNTDOWN GAP {gap_idx+1}: frame {frame_num}, time={current_time:.2f}s, remaining={countdown_remaining:.2f}s, lyrics resume at {gap['end']:.2f}s")
-                        countdown_gaps_logged.add(gap_idx)
-                    
-                    frame = create_countdown_frame_with_preview(
-                        countdown_remaining, 
-                        width, 
-                        height, 
-                        offset_lyrics, 
-                        gap['end'],
-                        display_mode,
-                        colors
-                    )
-                    break
-            
-            if not in_countdown:
-                # Debug: Log when first lyric should appear
-                if not first_lyric_logged and offset_lyrics and current_time >= offset_lyrics[0]['start']:
-                    print(f"   📊 First lyric should appear now: frame {frame_num}, current_time={current_time:.2f}s")
-                    first_lyric_logged = True
-                
-                # Check if we're in fadeout period
-                if current_time >= fadeout_start:
-                    # Calculate fade opacity (1.0 at start, 0.0 at end)
-                    fade_progress = (current_time - fadeout_start) / FADEOUT_DURATION
-                    fade_progress = min(1.0, fade_progress)
-                    fade_opacity = 1.0 - fade_progress
-                    
-                    # Create lyrics frame with fade
-                    frame = create_lyrics_frame_with_fade(
-                        current_time, 
-                        offset_lyrics, 
-                        display_mode, 
-                        width, 
-                        height, 
-                        colors,
-                        fade_opacity
-                    )
-                else:
-                    # Normal lyrics display
-                    frame = create_lyrics_frame(current_time, offset_lyrics, display_mode, width, height, colors)
-        
-        # Apply watermark for free tier, or custom watermark for Studio
-        if apply_watermark_to_video:
-            frame = apply_watermark(frame, width, height)
-        elif apply_custom_watermark:
-            frame = apply_studio_watermark(frame, width, height, custom_watermark_url)
-        
-        frame_path = os.path.join(frames_dir, f'frame_{frame_num:06d}.png')
-        frame.save(frame_path)
-        
-        if frame_num % 100 == 0:
-            print(f"  Frame {frame_num}/{total_frames}")
-    
-    print("🔧 Encoding video with FFmpeg...")
-    
+    # Group lyrics into display lines once for the whole video - every frame
+    # builder reads the same immutable layout
+    lines = group_lyrics_into_lines(offset_lyrics)
+    line_end_times = np.array([line[-1]['end'] for line in lines])
+
+    render_scale = RENDER_SCALES.get(video_quality, 1.0)
+    render_width = int(width * render_scale) // 2 * 2
+    render_height = int(height * render_scale) // 2 * 2
+    if render_scale < 1.0:
+        print(f"   📐 Rendering at {render_width}x{render_height}, FFmpeg upscales to {width}x{height}")
+
+    render_ctx = {
+        'width': render_width,
+        'height': render_height,
+        'colors': colors,
+        'artist': artist,
+        'title': title,
+        'intro_frames': intro_frames,
+        'offset_lyrics': offset_lyrics,
+        'offset_gaps': offset_gaps,
+        'lines': lines,
+        'line_end_times': line_end_times,
+        'display_mode': display_mode,
+        'fadeout_start': fadeout_start,
+        'apply_watermark': apply_watermark_to_video,
+        'custom_watermark_url': custom_watermark_url if apply_custom_watermark else None,
+        # Download and composite watermark art here in the parent, once -
+        # pool workers must not share the parent's pooled HTTP connections
+        'watermark_overlay': (_get_watermark_overlay(render_width, render_height)
+                              if apply_watermark_to_video else None),
+        'custom_watermark_logo': (get_custom_watermark(custom_watermark_url)
+                                  if apply_custom_watermark else None),
+    }
+
+    # Feed raw RGB straight into FFmpeg's stdin - no per-frame PNG encode
+    # and no frames directory on disk
     # Use audio_with_intro which has silence at the beginning
     ffmpeg_cmd = [
-        'ffmpeg', '-y',
-        '-framerate', str(FPS),
-        '-i', os.path.join(frames_dir, 'frame_%06d.png'),
+        'ffmpeg', '-loglevel', 'error', '-nostats', '-y',
+        '-f', 'rawvideo',
+        '-pix_fmt', 'rgb24',
+        '-s', f'{render_width}x{render_height}',
+        '-r', str(FPS),
+        '-i', '-',
         '-i', audio_with_intro,
-        '-c:v', 'libx264',
-        '-preset', 'medium',
-        '-crf', '23',
+        *_video_codec_args(video_quality),
+        *(['-vf', f'scale={width}:{height}:flags=lanczos'] if render_scale < 1.0 else []),
         '-c:a', 'aac',
+        '-aac_coder', 'fast',
         '-b:a', '192k',
         '-pix_fmt', 'yuv420p',
+        '-movflags', '+faststart',
         '-shortest',
         output_path
     ]
-    
-    subprocess.run(ffmpeg_cmd, check=True)
-    
-    import shutil
-    shutil.rmtree(frames_dir)
+
+    print("🔧 Rendering and encoding video with FFmpeg...")
+    encoder = subprocess.Popen(ffmpeg_cmd, stdin=subprocess.PIPE)
+
+    # Writer thread drains a bounded queue into FFmpeg's stdin so the pipe
+    # write (which can block on the encoder) overlaps with pulling the next
+    # rendered frame off the pool
+    frame_queue = queue.Queue(maxsize=32)
+    writer_error = []
+
+    def _drain_frames():
+        try:
+            for rgb in iter(frame_queue.get, None):
+                encoder.stdin.write(rgb)
+        except Exception as exc:
+            # FFmpeg died mid-encode (BrokenPipeError, disk full, ...).
+            # Record it but keep draining so the producer's put() never
+            # blocks on a full queue - it checks writer_error and aborts.
+            writer_error.append(exc)
+            while frame_queue.get() is not None:
+                pass
+        try:
+            encoder.stdin.close()
+        except Exception:
+            pass
+
+    writer = threading.Thread(target=_drain_frames, daemon=True)
+    writer.start()
+
+    # Frames are independent, so fan the render out across all cores.
+    # Chunks are submitted in a sliding window a few deep rather than all at
+    # once: rendering (mostly cache hits after dedup) far outpaces encoding,
+    # and eagerly submitted chunks would pile up as completed futures holding
+    # ~6MB of raw RGB each. The window only refills after a chunk's frames
+    # have been handed to the encoder queue, so parent-side buffering stays
+    # bounded no matter how far ahead the pool could get.
+    workers = os.cpu_count() or 1
+    chunk_size = 16
+    max_inflight = workers + 2
+    print(f"   🧵 Rendering {total_frames} frames across {workers} workers...")
+    try:
+        with ProcessPoolExecutor(max_workers=workers,
+                                 initializer=_init_render_worker,
+                                 initargs=(render_ctx,)) as executor:
+            pending = deque()
+            next_start = 0
+            frame_num = 0
+
+            def _fill_window():
+                nonlocal next_start
+                while next_start < total_frames and len(pending) < max_inflight:
+                    count = min(chunk_size, total_frames - next_start)
+                    pending.append(executor.submit(_render_chunk, next_start, count))
+                    next_start += count
+
+            _fill_window()
+            while pending:
+                for rgb in pending.popleft().result():
+                    if writer_error:
+                        break
+                    frame_queue.put(rgb)
+                    if frame_num % 100 == 0:
+                        print(f"  Frame {frame_num}/{total_frames}")
+                    frame_num += 1
+                if writer_error:
+                    # Encoder is gone - drop everything not yet running so
+                    # __exit__ doesn't render the rest of the song first
+                    for fut in pending:
+                        fut.cancel()
+                    break
+                _fill_window()
+    finally:
+        frame_queue.put(None)
+        writer.join()
+
+    if encoder.wait() != 0 or writer_error:
+        raise subprocess.CalledProcessError(encoder.returncode or 1, ffmpeg_cmd)
     
     print("✅ Video generation complete")
     return output_path
@@ -1590,10 +2209,17 @@ def generate_video(audio_path, lyrics, gaps, track_info, output_path, video_qual
 # MAIN HANDLER
 # ============================================
 
+def _cleanup_work_dir(work_dir):
+    """Delete the job's temp dir in the background - nothing waits on it."""
+    threading.Thread(target=shutil.rmtree, args=(work_dir,),
+                     kwargs={'ignore_errors': True}, daemon=True).start()
+
+
 def handler(event):
     """RunPod handler function"""
     callback_url = None
     project_id = None
+    r2_pool = None
     
     # Initialize fonts on first run
     initialize_fonts()
@@ -1656,6 +2282,7 @@ def handler(event):
         
         work_dir = tempfile.mkdtemp()
         results = {}
+        intro_prep = None
         
         # RENDER_ONLY MODE: Skip vocal separation, use existing processed audio
         if processing_mode == 'render_only':
@@ -1702,9 +2329,25 @@ def handler(event):
             print("🎵 Starting vocal separation...")
             instrumental_path, vocals_path = separate_vocals(audio_path, work_dir)
             
+            # R2 uploads are pure network I/O, so hand them to a small pool
+            # and let them overlap with the AssemblyAI transcription below
+            r2_pool = ThreadPoolExecutor(max_workers=3)
+            upload_futures = {}
+            
             if processing_type in ['remove_vocals']:
                 instrumental_key = f"processed/{project_id}/instrumental.wav"
-                results['processed_audio_url'] = upload_to_r2(instrumental_path, instrumental_key)
+                upload_futures['processed_audio_url'] = r2_pool.submit(
+                    upload_to_r2, instrumental_path, instrumental_key)
+                # Vocals go to R2 too so AssemblyAI can pull the public URL
+                # instead of us pushing the same bytes a second time
+                vocals_key = f"processed/{project_id}/vocals.wav"
+                upload_futures['vocals_audio_url'] = r2_pool.submit(
+                    upload_to_r2, vocals_path, vocals_key)
+                # The intro-silence remix only needs the instrumental, so run
+                # that ffmpeg pass during transcription too
+                intro_prep = r2_pool.submit(
+                    add_silence_to_audio, instrumental_path, INTRO_DURATION,
+                    os.path.join(work_dir, 'audio_with_intro.wav'))
             
             elif processing_type == 'guide_vocals':
                 # Guide Vocals mode: Mix instrumental (100%) + vocals (30%) for singers who need guidance
@@ -1714,34 +2357,33 @@ def handler(event):
                 instrumental_wav, sr = torchaudio.load(instrumental_path)
                 vocals_wav, _ = torchaudio.load(vocals_path)
                 
-                # Ensure same length (pad shorter one with silence)
+                # Ensure same length (zero-pad the shorter one in one op)
                 max_len = max(instrumental_wav.shape[1], vocals_wav.shape[1])
                 if instrumental_wav.shape[1] < max_len:
-                    padding = torch.zeros(instrumental_wav.shape[0], max_len - instrumental_wav.shape[1])
-                    instrumental_wav = torch.cat([instrumental_wav, padding], dim=1)
+                    instrumental_wav = torch.nn.functional.pad(
+                        instrumental_wav, (0, max_len - instrumental_wav.shape[1]))
                 if vocals_wav.shape[1] < max_len:
-                    padding = torch.zeros(vocals_wav.shape[0], max_len - vocals_wav.shape[1])
-                    vocals_wav = torch.cat([vocals_wav, padding], dim=1)
-                
-                # Mix: instrumental at 100% + vocals at 30%
-                guide_mix = instrumental_wav + (vocals_wav * 0.3)
+                    vocals_wav = torch.nn.functional.pad(
+                        vocals_wav, (0, max_len - vocals_wav.shape[1]))
                 
-                # Normalize to prevent clipping
-                max_val = guide_mix.abs().max()
-                if max_val > 1.0:
-                    guide_mix = guide_mix / max_val
+                # Mix in place: instrumental at 100% + vocals at 30%, then
+                # hard-limit the rare clipped samples instead of rescanning
+                # and renormalizing the whole buffer
+                guide_mix = instrumental_wav.add_(vocals_wav, alpha=0.3)
+                torch.clamp_(guide_mix, -1.0, 1.0)
                 
                 # Save the mixed track
                 guide_path = os.path.join(work_dir, 'guide_vocals.wav')
-                torchaudio.save(guide_path, guide_mix, sr)
+                _save_wav_16bit(guide_path, guide_mix, sr)
                 
                 guide_key = f"processed/{project_id}/guide_vocals.wav"
-                guide_url = upload_to_r2(guide_path, guide_key)
-                results['processed_audio_url'] = guide_url
+                upload_futures['processed_audio_url'] = r2_pool.submit(
+                    upload_to_r2, guide_path, guide_key)
                 
                 # Also save the isolated vocals for potential future use
                 vocals_key = f"processed/{project_id}/vocals.wav"
-                results['vocals_audio_url'] = upload_to_r2(vocals_path, vocals_key)
+                upload_futures['vocals_audio_url'] = r2_pool.submit(
+                    upload_to_r2, vocals_path, vocals_key)
                 
                 # IMPORTANT: Use guide vocals mix for video generation
                 instrumental_path = guide_path
@@ -1753,8 +2395,30 @@ def handler(event):
             gaps = []
             
             if include_lyrics:
-                # Use AssemblyAI for transcription and alignment
-                lyrics = transcribe_with_assemblyai(vocals_path, user_lyrics_text)
+                # VAD-style gate: if the vocals carry a lot of leading or
+                # trailing silence, send AssemblyAI a trimmed copy and shift
+                # the word timestamps back afterwards
+                trimmed_path, lead_offset = _trim_vocal_silence(vocals_path, work_dir)
+                
+                if trimmed_path is not None:
+                    lyrics = transcribe_with_assemblyai(trimmed_path, user_lyrics_text)
+                    if lead_offset:
+                        for word in lyrics:
+                            word['start'] += lead_offset
+                            word['end'] += lead_offset
+                else:
+                    # Hand AssemblyAI the R2 vocals URL when we have a public
+                    # one, skipping the duplicate upload of the same file
+                    vocals_url = None
+                    vocals_upload = upload_futures.get('vocals_audio_url')
+                    if vocals_upload is not None:
+                        vocals_url = vocals_upload.result()
+                        if not vocals_url.startswith('http'):
+                            vocals_url = None  # No public R2 URL configured
+                    
+                    # Use AssemblyAI for transcription and alignment
+                    lyrics = transcribe_with_assemblyai(vocals_path, user_lyrics_text,
+                                                        audio_url=vocals_url)
                 
                 if clean_version and lyrics:
                     print("🛡️ Applying profanity filter...")
@@ -1768,20 +2432,24 @@ def handler(event):
                 
                 results['lyrics'] = lyrics
             
+            # Collect the uploads that ran while transcription was in flight
+            for result_key, upload_future in upload_futures.items():
+                results[result_key] = upload_future.result()
+            r2_pool.shutdown()
+            
             # Check if transcribe_only - stop here
             if processing_mode == 'transcribe_only':
                 print("📋 Transcribe-only mode - skipping video generation")
                 
                 if callback_url:
                     print(f"📤 Sending callback to {callback_url}")
-                    requests.post(callback_url, json={
+                    _post_json(callback_url, {
                         'project_id': project_id,
                         'status': 'transcribed',
                         'results': results
                     })
                 
-                import shutil
-                shutil.rmtree(work_dir)
+                _cleanup_work_dir(work_dir)
                 
                 print("✅ Transcription complete!")
                 return {
@@ -1791,6 +2459,8 @@ def handler(event):
                 }
         
         # VIDEO GENERATION (for 'full' or 'render_only' modes)
+        if intro_prep is not None:
+            intro_prep.result()  # Intro remix finished during transcription
         audio_duration = get_audio_duration(instrumental_path if instrumental_path else audio_path)
         
         selected_display_mode = select_display_mode(lyrics, audio_duration, display_mode)
@@ -1817,14 +2487,13 @@ def handler(event):
         
         if callback_url:
             print(f"📤 Sending callback to {callback_url}")
-            requests.post(callback_url, json={
+            _post_json(callback_url, {
                 'project_id': project_id,
                 'status': 'completed',
                 'results': results
             })
         
-        import shutil
-        shutil.rmtree(work_dir)
+        _cleanup_work_dir(work_dir)
         
         print("✅ Processing complete!")
         return {
@@ -1838,8 +2507,15 @@ def handler(event):
         import traceback
         traceback.print_exc()
         
+        # Settle the background uploads before reporting failure: cancel
+        # what hasn't started and wait out what has, so the backend never
+        # sees a 'failed' project whose R2 objects appear afterwards (and
+        # the worker doesn't leak pool threads across jobs)
+        if r2_pool is not None:
+            r2_pool.shutdown(wait=True, cancel_futures=True)
+        
         if callback_url:
-            requests.post(callback_url, json={
+            _post_json(callback_url, {
                 'project_id': project_id,
                 'status': 'failed',
                 'error': str(e)
@@ -1851,5 +2527,19 @@ def handler(event):
         }
 
 
+# Load Demucs and run one tiny separation at cold start so the first real
+# job doesn't pay for weight loading or cuDNN algorithm selection
+try:
+    print("🔥 Warming up Demucs...")
+    _warmup_wav = torch.zeros(1, 2, SAMPLE_RATE,
+                              device='cuda' if torch.cuda.is_available() else 'cpu')
+    with torch.no_grad():
+        apply_model(_get_demucs(), _warmup_wav, device=_warmup_wav.device,
+                    split=True, overlap=0.25, progress=False)
+    del _warmup_wav
+    print("✅ Demucs ready")
+except Exception as e:
+    print(f"⚠️ Demucs warmup failed (model will load on first job): {e}")
+
 # RunPod serverless handler
 runpod.serverless.start({"handler": handler})
\ No newline at end of file